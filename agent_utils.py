@@ -8,6 +8,7 @@ import base64
 import io
 import math
 import multiprocessing
+import queue
 import time
 import tkinter as tk
 from tkinter import ttk
@@ -88,6 +89,9 @@ class ImageGridViewer:
         
         for i, image_data in enumerate(self.images):
             if i < len(self.labels):
+                # Same frame already shown in this cell, skip decoding and resizing it again
+                if getattr(self.labels[i], 'image_data', None) == image_data:
+                    continue
                 try:
                     img_bytes = base64.b64decode(image_data)
                     pil_img = Image.open(io.BytesIO(img_bytes))
@@ -96,6 +100,7 @@ class ImageGridViewer:
                     
                     self.labels[i].configure(image=tk_img)
                     self.labels[i].image = tk_img  # Keep reference
+                    self.labels[i].image_data = image_data
                 except Exception as e:
                     print(f"Error displaying image {i}: {e}")
         
@@ -103,9 +108,11 @@ class ImageGridViewer:
         for i in range(len(self.images), len(self.labels)):
             self.labels[i].configure(image="")
             self.labels[i].image = None
+            self.labels[i].image_data = None
     
     def check_queue(self):
         """Check for new images from main process."""
+        latest_images = None
         try:
             while True:
                 try:
@@ -113,13 +120,17 @@ class ImageGridViewer:
                     if images_data == "QUIT":
                         self.root.quit()
                         return
-                    self.images = images_data
-                    self.update_grid()
+                    latest_images = images_data
                 except:
                     break
         except:
             pass
         
+        # Only the newest batch is visible, so redraw once and only when something arrived
+        if latest_images is not None:
+            self.images = latest_images
+            self.update_grid()
+        
         # Schedule next check
         self.root.after(100, self.check_queue)
     
@@ -141,8 +152,11 @@ def image_grid_viewer_process(image_queue):
 class ImageViewer:
     """Manages the image display window in a separate process."""
     
+    # The viewer only ever shows the newest batch, so a couple of pending batches is plenty
+    MAX_PENDING_BATCHES = 2
+    
     def __init__(self):
-        self.image_queue = multiprocessing.Queue()
+        self.image_queue = multiprocessing.Queue(maxsize=self.MAX_PENDING_BATCHES)
         self.image_viewer_process = None
         self.current_images = []
     
@@ -155,6 +169,8 @@ class ImageViewer:
                 daemon=True
             )
             self.image_viewer_process.start()
+            # A fresh window has nothing on screen yet
+            self.current_images = []
             print("📸 Image viewer window opened")
             time.sleep(0.5)
     
@@ -171,11 +187,27 @@ class ImageViewer:
             if image_part.get('source', {}).get('data'):
                 new_images.append(image_part['source']['data'])
         
+        # The viewer already shows this exact batch, don't pickle and resend it
+        if new_images == self.current_images:
+            return
+        
         if new_images:
-            self.current_images = new_images
             try:
-                self.image_queue.put(self.current_images)
+                try:
+                    self.image_queue.put_nowait(new_images)
+                except queue.Full:
+                    # Viewer is lagging, drop the oldest pending batch instead of growing the queue.
+                    # Recently put batches may still sit in the queue's feeder thread, so wait briefly for one.
+                    try:
+                        self.image_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                    self.image_queue.put_nowait(new_images)
+                # Only remember the batch once it is actually on its way to the viewer
+                self.current_images = new_images
                 print(f"📸 Updated image viewer with {len(new_images)} images")
+            except queue.Full:
+                print("📸 Image viewer is busy, skipping this batch")
             except Exception as e:
                 print(f"📸 Error updating image viewer: {e}")
     
@@ -184,7 +216,10 @@ class ImageViewer:
         if self.image_viewer_process and self.image_viewer_process.is_alive():
             print("📸 Closing image viewer...")
             try:
-                self.image_queue.put("QUIT")
+                try:
+                    self.image_queue.put("QUIT", timeout=1)
+                except queue.Full:
+                    pass  # Viewer isn't draining, it gets terminated below
                 self.image_viewer_process.join(timeout=2)
                 if self.image_viewer_process.is_alive():
                     self.image_viewer_process.terminate()
@@ -15,6 +15,28 @@ from config import robot_config
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
+# Monitor refresh period
+UPDATE_PERIOD_NS = 100_000_000
+
+# Static parts of the monitor frame, built once instead of on every refresh
+RULE_80 = "=" * 80
+RULE_60 = "-" * 60
+RULE_50 = "-" * 50
+RULE_30 = "-" * 30
+JOINT_TABLE_HEADER = f"{'Joint Name':<18} | {'Degrees':<10} | {'Normalized':<12}"
+MOTOR_RANGES_TABLE = "\n".join(
+    [
+        "\n📋 MOTOR VALUE RANGES (Reference)",
+        RULE_60,
+        f"{'Joint Name':<18} | {'Norm Range':<15} | {'Degree Range'}",
+        RULE_60,
+    ]
+    + [
+        f"{joint_name:<18} | {norm_min:>4.0f} to {norm_max:>4.0f}   | {deg_min:>6.1f}° to {deg_max:>6.1f}°"
+        for joint_name, (norm_min, norm_max, deg_min, deg_max) in robot_config.MOTOR_NORMALIZED_TO_DEGREE_MAPPING.items()
+    ]
+)
+
 def clear_screen():
     """Clear the terminal screen."""
     import os
@@ -31,16 +53,16 @@ def print_robot_state(controller):
     state = result.robot_state
     
     # Header
-    print("=" * 80)
+    print(RULE_80)
     print(f"🤖 ROBOT POSITION MONITOR - {controller.robot_type.upper()}")
     print(f"📅 {time.strftime('%Y-%m-%d %H:%M:%S')} | 🔓 TORQUE DISABLED - Move robot manually!")
-    print("=" * 80)
+    print(RULE_80)
     
     # Joint positions in both formats
     print("\n📊 JOINT POSITIONS")
-    print("-" * 60)
-    print(f"{'Joint Name':<18} | {'Degrees':<10} | {'Normalized':<12}")
-    print("-" * 60)
+    print(RULE_60)
+    print(JOINT_TABLE_HEADER)
+    print(RULE_60)
     
     for joint_name in sorted(controller.joint_names):
         deg_val = state["joint_positions_deg"][joint_name]
@@ -49,27 +71,21 @@ def print_robot_state(controller):
     
     # Cartesian coordinates
     print(f"\n🎯 CARTESIAN COORDINATES")
-    print("-" * 30)
+    print(RULE_30)
     cartesian = state["cartesian_mm"]
     print(f"X (forward/back): {cartesian['x']:>8.1f} mm")
     print(f"Z (up/down):      {cartesian['z']:>8.1f} mm")
     
     # Human-readable state
     print(f"\n🎮 HUMAN-READABLE STATE")
-    print("-" * 50)
+    print(RULE_50)
     human_state = state["human_readable_state"]
     for key, value in human_state.items():
         unit = "mm" if "mm" in key else ("%" if "pct" in key else "°")
         print(f"{key:<30}: {value:>8.1f} {unit}")
     
     # Motor value ranges (reference)
-    print(f"\n📋 MOTOR VALUE RANGES (Reference)")
-    print("-" * 60)
-    print(f"{'Joint Name':<18} | {'Norm Range':<15} | {'Degree Range'}")
-    print("-" * 60)
-    
-    for joint_name, (norm_min, norm_max, deg_min, deg_max) in robot_config.MOTOR_NORMALIZED_TO_DEGREE_MAPPING.items():
-        print(f"{joint_name:<18} | {norm_min:>4.0f} to {norm_max:>4.0f}   | {deg_min:>6.1f}° to {deg_max:>6.1f}°")
+    print(MOTOR_RANGES_TABLE)
     
     print(f"\n💡 Press Ctrl+C to exit")
     return True
@@ -89,17 +105,25 @@ def main():
             print("🔓 TORQUE DISABLED: Robot can now be moved manually!")
             print("📊 Starting position monitoring...")
             
-            # Continuous monitoring loop
+            # Continuous monitoring loop, updates every 100ms for responsive monitoring.
+            # The period is kept against a deadline so read/render time doesn't add to it.
+            next_update_ns = time.perf_counter_ns()
             while True:
                 clear_screen()
                 
                 if not print_robot_state(controller):
                     print("❌ Failed to get robot state. Retrying in 1 second...")
                     time.sleep(1)
+                    next_update_ns = time.perf_counter_ns()
                     continue
                 
-                # Update every 100ms for responsive monitoring
-                time.sleep(0.1)
+                next_update_ns += UPDATE_PERIOD_NS
+                remaining_ns = next_update_ns - time.perf_counter_ns()
+                if remaining_ns > 0:
+                    time.sleep(remaining_ns / 1e9)
+                else:
+                    # Fell behind, resync instead of bursting to catch up
+                    next_update_ns = time.perf_counter_ns()
                 
     except KeyboardInterrupt:
         clear_screen()
@@ -4,9 +4,10 @@ Keyboard controller for intuitive robot control.
 """
 
 import sys
-import time
 import os
 import logging
+import queue
+import threading
 from datetime import datetime
 from typing import Dict, Any
 from pynput import keyboard
@@ -33,6 +34,10 @@ class KeyboardController:
         self.snapshots_dir = "camera_snapshots"
         os.makedirs(self.snapshots_dir, exist_ok=True)
         
+        # Snapshots are encoded and written by a background thread so key handling isn't blocked on disk I/O
+        self.snapshot_queue = queue.Queue()
+        self.snapshot_writer = None
+        
         # Key mappings using exact same keys as original
         self.key_mappings = {
             # Cartesian movements
@@ -66,6 +71,14 @@ class KeyboardController:
             keyboard.KeyCode.from_char('3'): ("preset", "3"),
             keyboard.KeyCode.from_char('4'): ("preset", "4"),
         }
+        
+        # Dispatch table so a key press costs one lookup instead of walking an if/elif chain
+        self.action_handlers = {
+            "intuitive_move": self.handle_intuitive_move,
+            "gripper_delta": self.handle_gripper_delta,
+            "preset": self.handle_preset,
+            "camera_snapshot": self.handle_camera_snapshot,
+        }
 
     def on_press(self, key: Any) -> bool:
         """Handle key press events."""
@@ -73,65 +86,94 @@ class KeyboardController:
             self.stop()
             return False  # Stop listener
 
-        if key in self.key_mappings:
-            action_type, params = self.key_mappings[key]
+        mapping = self.key_mappings.get(key)
+        if mapping is not None:
+            action_type, params = mapping
             
             try:
-                if action_type == "intuitive_move":
-                    result = self.robot.execute_intuitive_move(**params, use_interpolation=False)
-                    if not result.ok:
-                        print(f"Movement error: {result.msg}")
-                        
-                elif action_type == "gripper_delta":
-                    delta = params
-                    result = self.robot.increment_joints_by_delta({'gripper': delta})
-                    if not result.ok:
-                        print(f"Gripper error: {result.msg}")
-                        
-                elif action_type == "preset":
-                    preset_key = params
-                    result = self.robot.apply_named_preset(preset_key)
-                    if result.ok:
-                        print(f"Applied preset {preset_key}")
-                    else:
-                        print(f"Preset error: {result.msg}")
-                        
-                elif action_type == "camera_snapshot":
-                    self.take_camera_snapshot()
-                    
+                self.action_handlers[action_type](params)
             except Exception as e:
                 logger.error(f"Error executing command: {e}", exc_info=True)
                 
         return True
 
+    def handle_intuitive_move(self, params: Dict[str, float]) -> None:
+        """Execute a cartesian/rotation step without interpolation."""
+        result = self.robot.execute_intuitive_move(**params, use_interpolation=False)
+        if not result.ok:
+            print(f"Movement error: {result.msg}")
+
+    def handle_gripper_delta(self, delta: float) -> None:
+        """Open or close the gripper by a percentage step."""
+        result = self.robot.increment_joints_by_delta({'gripper': delta})
+        if not result.ok:
+            print(f"Gripper error: {result.msg}")
+
+    def handle_preset(self, preset_key: str) -> None:
+        """Move to a named preset position."""
+        result = self.robot.apply_named_preset(preset_key)
+        if result.ok:
+            print(f"Applied preset {preset_key}")
+        else:
+            print(f"Preset error: {result.msg}")
+
+    def handle_camera_snapshot(self, _params: None) -> None:
+        """Take a camera snapshot."""
+        self.take_camera_snapshot()
+
     def take_camera_snapshot(self) -> None:
-        """Take snapshots from all available cameras."""
+        """Take snapshots from all available cameras and queue them for saving."""
         try:
+            # Camera read stays on this thread, it shares the motor bus with movement commands
             images = self.robot.get_camera_images()
             if not images:
                 print("No camera images available")
                 return
                 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            saved_count = 0
-            
-            for camera_name, img_array in images.items():
-                try:
-                    pil_img = Image.fromarray(img_array)
-                    filename = os.path.join(self.snapshots_dir, f"{camera_name}_{timestamp}.jpg")
-                    pil_img.save(filename)
-                    saved_count += 1
-                    print(f"Saved {camera_name} snapshot: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to save snapshot for '{camera_name}': {e}")
-                    
-            if saved_count > 0:
-                print(f"📸 Saved {saved_count} camera snapshot(s) to {self.snapshots_dir}/")
+            self.snapshot_queue.put((timestamp, images))
                 
         except Exception as e:
             logger.error(f"Camera snapshot error: {e}", exc_info=True)
             print("Failed to take camera snapshot")
 
+    def save_camera_snapshots(self, timestamp: str, images: Dict[str, Any]) -> None:
+        """Save one image per camera to the snapshots directory."""
+        saved_count = 0
+        
+        for camera_name, img_array in images.items():
+            try:
+                pil_img = Image.fromarray(img_array)
+                filename = os.path.join(self.snapshots_dir, f"{camera_name}_{timestamp}.jpg")
+                # Write to a temp file and rename so an interrupted save never leaves a truncated JPEG
+                tmp_filename = filename + ".tmp"
+                try:
+                    pil_img.save(tmp_filename, format="JPEG")
+                    os.replace(tmp_filename, filename)
+                except Exception:
+                    # Don't leave a partial temp file behind in the snapshots directory
+                    if os.path.exists(tmp_filename):
+                        os.remove(tmp_filename)
+                    raise
+                saved_count += 1
+                print(f"Saved {camera_name} snapshot: {filename}")
+            except Exception as e:
+                logger.error(f"Failed to save snapshot for '{camera_name}': {e}")
+                
+        if saved_count > 0:
+            print(f"📸 Saved {saved_count} camera snapshot(s) to {self.snapshots_dir}/")
+
+    def snapshot_writer_loop(self) -> None:
+        """Save queued snapshots until a None sentinel is received."""
+        while True:
+            item = self.snapshot_queue.get()
+            if item is None:
+                break
+            try:
+                self.save_camera_snapshots(*item)
+            except Exception as e:
+                logger.error(f"Snapshot writer error: {e}", exc_info=True)
+
     def start(self) -> None:
         """Start the keyboard controller."""
         # Print controls once at startup
@@ -158,6 +200,8 @@ class KeyboardController:
         print("="*50)
         
         self.running = True
+        self.snapshot_writer = threading.Thread(target=self.snapshot_writer_loop, daemon=True)
+        self.snapshot_writer.start()
         try:
             self.listener = keyboard.Listener(on_press=self.on_press)
             self.listener.start()
@@ -176,14 +220,22 @@ class KeyboardController:
                     self.listener.stop()
                 except Exception as e:
                     logger.error(f"Error stopping listener: {e}")
+            # Let the writer finish snapshots that are still queued
+            if self.snapshot_writer and self.snapshot_writer.is_alive():
+                self.snapshot_queue.put(None)
+                self.snapshot_writer.join()
 
     def wait_for_exit(self) -> None:
         """Wait for the controller to exit."""
-        if hasattr(self, 'listener'):
-            try:
-                self.listener.join()
-            except Exception as e:
-                logger.error(f"Error waiting for listener: {e}")
+        if not hasattr(self, 'listener'):
+            return
+        try:
+            # Join in short slices, an untimed join isn't interrupted by Ctrl+C on Windows.
+            # A listener that failed to start (or already stopped) is never joined.
+            while self.listener.is_alive():
+                self.listener.join(0.5)
+        except Exception as e:
+            logger.error(f"Error waiting for listener: {e}")
 
 def main():
     """Main entry point with proper error handling."""
@@ -202,9 +254,8 @@ def main():
         kb_controller = KeyboardController(robot_instance)
         kb_controller.start()
         
-        # Keep main thread alive while keyboard listener runs
-        while kb_controller.running:
-            time.sleep(0.1)
+        # Wait for the keyboard listener to exit
+        kb_controller.wait_for_exit()
             
     except KeyboardInterrupt:
         print("\n⚠️  KeyboardInterrupt received, shutting down...")
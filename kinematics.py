@@ -21,6 +21,15 @@ class KinematicsModel:
         # Calculated offsets in radians
         self.SHOULDER_OFFSET_ANGLE_RAD = math.asin(self.SHOULDER_MOUNT_OFFSET_MM / self.L1)
         self.ELBOW_OFFSET_ANGLE_RAD = math.asin(self.ELBOW_MOUNT_OFFSET_MM / self.L2)
+        self.SHOULDER_OFFSET_ANGLE_DEG = math.degrees(self.SHOULDER_OFFSET_ANGLE_RAD)
+        self.ELBOW_OFFSET_ANGLE_DEG = math.degrees(self.ELBOW_OFFSET_ANGLE_RAD)
+
+        # Derived link constants, precomputed so IK and validity checks stay pure scalar math
+        self.L1_SQ = self.L1 ** 2
+        self.L2_SQ = self.L2 ** 2
+        self.TWO_L1 = 2 * self.L1
+        self.INV_L2 = 1.0 / self.L2
+        self.MAX_REACH_MM = self.L1 + self.L2
 
     def forward_kinematics(self, shoulder_lift_deg: float, elbow_flex_deg: float) -> tuple[float, float]:
         """Calculates x, z position of the wrist flex motor based on shoulder_lift and elbow_flex angles."""
@@ -36,13 +45,13 @@ class KinematicsModel:
         d_sq = target_x**2 + z_adj**2
         d = math.sqrt(d_sq)
         phi1 = math.atan2(z_adj, target_x)
-        phi2 = math.acos(min(1.0, max(-1.0, (self.L1**2 + d_sq - self.L2**2) / (2 * self.L1 * d))))
-        shoulder_lift_deg = 180.0 - math.degrees(phi1 + phi2) - math.degrees(self.SHOULDER_OFFSET_ANGLE_RAD)
+        phi2 = math.acos(min(1.0, max(-1.0, (self.L1_SQ + d_sq - self.L2_SQ) / (self.TWO_L1 * d))))
+        shoulder_lift_deg = 180.0 - math.degrees(phi1 + phi2) - self.SHOULDER_OFFSET_ANGLE_DEG
         alpha1 = math.radians(shoulder_lift_deg) + self.SHOULDER_OFFSET_ANGLE_RAD
-        cos2_arg = min(1.0, max(-1.0, (target_x + self.L1 * math.cos(alpha1)) / self.L2))
-        sin2_arg = min(1.0, max(-1.0, (z_adj - self.L1 * math.sin(alpha1)) / self.L2))
+        cos2_arg = min(1.0, max(-1.0, (target_x + self.L1 * math.cos(alpha1)) * self.INV_L2))
+        sin2_arg = min(1.0, max(-1.0, (z_adj - self.L1 * math.sin(alpha1)) * self.INV_L2))
         ang2 = math.atan2(sin2_arg, cos2_arg)
-        elbow_flex_deg = math.degrees(ang2 + math.radians(shoulder_lift_deg)) - math.degrees(self.ELBOW_OFFSET_ANGLE_RAD)
+        elbow_flex_deg = math.degrees(ang2 + math.radians(shoulder_lift_deg)) - self.ELBOW_OFFSET_ANGLE_DEG
         return shoulder_lift_deg, elbow_flex_deg
 
     def is_cartesian_target_valid(self, x: float, z: float) -> tuple[bool, str]:
@@ -57,8 +66,8 @@ class KinematicsModel:
             return False, f"Target ({x:.1f},{z:.1f})mm violates: if x < 20mm, z must be >= 150mm."
         
         z_adj = z - self.BASE_HEIGHT_MM
-        distance = math.sqrt(z_adj**2 + x**2)
-        max_reach = self.L1 + self.L2
+        distance = math.hypot(x, z_adj)
+        max_reach = self.MAX_REACH_MM
         
         if distance > max_reach - 1:
             return False, f"Target ({x:.1f},{z:.1f})mm is beyond max reach {max_reach-1:.1f}mm (safety margin: 1mm), distance is {distance:.1f}mm"
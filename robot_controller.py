@@ -3,6 +3,7 @@ The main logic of the robot controller.
 Used by all other scripts.
 """
 
+import importlib
 import logging
 import json
 from typing import Dict, List, Optional, Any
@@ -11,10 +12,8 @@ from dataclasses import dataclass, field
 import time
 
 # --- Lerobot Imports ---
+# Robot implementations are imported on connect, see RobotController.ROBOT_TYPES
 from lerobot.robots import Robot
-from lerobot.robots.so100_follower import SO100Follower, SO100FollowerConfig
-from lerobot.robots.so101_follower import SO101Follower, SO101FollowerConfig
-from lerobot.robots.lekiwi import LeKiwiClient, LeKiwiClientConfig
 
 # --- Local Imports ---
 from config import robot_config
@@ -25,7 +24,7 @@ if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class MoveResult:
     """Result of a robot movement operation."""
     ok: bool
@@ -45,17 +44,27 @@ class MoveResult:
         if self.warnings:
             json_output["warnings"] = self.warnings
 
-        logger.info(f"MoveResult JSON: {json.dumps(json_output)}")
+        # Serializing the full state is not free, only do it when the line is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("MoveResult JSON: %s", json.dumps(json_output))
         return json_output
 
 class RobotController:
-    # Robot type mapping
+    # Robot type mapping: type -> (module, robot class, config class).
+    # Imported lazily so only the selected robot's dependencies are loaded (LeKiwi pulls in zmq, etc.)
     ROBOT_TYPES = {
-        "so100": (SO100Follower, SO100FollowerConfig),
-        "so101": (SO101Follower, SO101FollowerConfig),
-        "lekiwi": (LeKiwiClient, LeKiwiClientConfig),
+        "so100": ("lerobot.robots.so100_follower", "SO100Follower", "SO100FollowerConfig"),
+        "so101": ("lerobot.robots.so101_follower", "SO101Follower", "SO101FollowerConfig"),
+        "lekiwi": ("lerobot.robots.lekiwi", "LeKiwiClient", "LeKiwiClientConfig"),
     }
 
+    # Order of the LeKiwi observation.state vector
+    LEKIWI_STATE_ORDER = (
+        "arm_shoulder_pan.pos", "arm_shoulder_lift.pos", "arm_elbow_flex.pos",
+        "arm_wrist_flex.pos", "arm_wrist_roll.pos", "arm_gripper.pos",
+        "x.vel", "y.vel", "theta.vel",
+    )
+
     def __init__(self, read_only: bool = False):
         self.robot_type = robot_config.lerobot_config.get("type")
         self.robot: Optional[Robot] = None
@@ -64,6 +73,28 @@ class RobotController:
         # Get config values
         self.motor_mapping = robot_config.MOTOR_NORMALIZED_TO_DEGREE_MAPPING
         self.joint_names = list(self.motor_mapping.keys())
+        # lerobot position keys per joint, built once instead of formatted on every action/observation
+        key_prefix = "arm_" if self.robot_type == "lekiwi" else ""
+        self._pos_keys: Dict[str, str] = {name: f"{key_prefix}{name}.pos" for name in self.joint_names}
+        self._state_indices: Dict[str, int] = {
+            name: self.LEKIWI_STATE_ORDER.index(key)
+            for name, key in self._pos_keys.items() if key in self.LEKIWI_STATE_ORDER
+        }
+        # Linear degree <-> normalized calibration per joint as (scale, offset),
+        # so each conversion is a single multiply-add
+        self._deg_to_norm_coeffs: Dict[str, tuple[float, float]] = {}
+        self._norm_to_deg_coeffs: Dict[str, tuple[float, float]] = {}
+        for name, (norm_min, norm_max, deg_min, deg_max) in self.motor_mapping.items():
+            deg_scale = 0.0 if deg_max == deg_min else (norm_max - norm_min) / (deg_max - deg_min)
+            norm_scale = 0.0 if norm_max == norm_min else (deg_max - deg_min) / (norm_max - norm_min)
+            self._deg_to_norm_coeffs[name] = (deg_scale, norm_min - deg_min * deg_scale)
+            self._norm_to_deg_coeffs[name] = (norm_scale, deg_min - norm_min * norm_scale)
+        # Normalized range accepted by lerobot per joint, as (min, max)
+        self._norm_limits: Dict[str, tuple[float, float]] = {
+            name: (0, 100) if name == "gripper" else (-100, 100) for name in self.joint_names
+        }
+        # Configured camera names are fixed for the session, so look them up once
+        self._camera_names = tuple(robot_config.lerobot_config.get("cameras", {}).keys())
         self.presets = robot_config.PRESET_POSITIONS
         self.movement_config = robot_config.MOVEMENT_CONSTANTS
         
@@ -82,13 +113,12 @@ class RobotController:
             # In read-only mode, connect and disable torque for manual movement
             logger.info("Initializing in READ-ONLY mode")
             self._connect_robot_readonly()
-            self._refresh_state()
         else:
             # Normal mode - full initialization
             self._connect_robot()
-            self._refresh_state()
+        self._refresh_state()
 
-        logger.info(f"RobotController initialized. Type: {self.robot_type}, Read-only: {read_only}")
+        logger.info("RobotController initialized. Type: %s, Read-only: %s", self.robot_type, read_only)
 
     def __enter__(self) -> 'RobotController':
         return self
@@ -110,16 +140,21 @@ class RobotController:
         
         try:
             # Create config and robot using LeRobot factory
-            robot_class, config_class = self.ROBOT_TYPES.get(self.robot_type, (None, None))
-            if not robot_class:
+            robot_spec = self.ROBOT_TYPES.get(self.robot_type)
+            if not robot_spec:
                 raise ValueError(f"Unsupported robot type: '{self.robot_type}'")
             
+            module_name, robot_class_name, config_class_name = robot_spec
+            robot_module = importlib.import_module(module_name)
+            robot_class = getattr(robot_module, robot_class_name)
+            config_class = getattr(robot_module, config_class_name)
+            
             cfg = config_class(**robot_params)
             self.robot = robot_class(cfg)
             self.robot.connect()
-            logger.info(f"Connected to {self.robot_type}")
+            logger.info("Connected to %s", self.robot_type)
         except Exception as e:
-            logger.error(f"Failed to connect to robot: {e}")
+            logger.error("Failed to connect to robot: %s", e)
             raise
 
     def _connect_robot_readonly(self) -> None:
@@ -129,55 +164,45 @@ class RobotController:
 
             if self.robot_type != "lekiwi":
                 self.robot.bus.disable_torque()
-                logger.info(f"Connected to {self.robot_type} in READ-ONLY mode")
+                logger.info("Connected to %s in READ-ONLY mode", self.robot_type)
                 logger.info("🔓 TORQUE DISABLED: Robot can now be moved manually while monitoring positions")
 
             else:
                 logger.warning("LeKiwi does not support remote torque disabling, you need to do it manually on the host.")
             
         except Exception as e:
-            logger.error(f"Failed to connect to robot in read-only mode: {e}")
+            logger.error("Failed to connect to robot in read-only mode: %s", e)
             raise
 
     def _deg_to_norm(self, joint_name: str, degrees: float) -> float:
         """Convert degrees to normalized value."""
-        norm_min, norm_max, deg_min, deg_max = self.motor_mapping[joint_name]
-        if deg_max == deg_min:
-            return norm_min
-        return norm_min + ((degrees - deg_min) * (norm_max - norm_min)) / (deg_max - deg_min)
+        scale, offset = self._deg_to_norm_coeffs[joint_name]
+        return degrees * scale + offset
 
     def _norm_to_deg(self, joint_name: str, normalized: float) -> float:
         """Convert normalized value to degrees."""
-        norm_min, norm_max, deg_min, deg_max = self.motor_mapping[joint_name]
-        if norm_max == norm_min:
-            return deg_min
-        return deg_min + ((normalized - norm_min) * (deg_max - deg_min)) / (norm_max - norm_min)
+        scale, offset = self._norm_to_deg_coeffs[joint_name]
+        return normalized * scale + offset
 
-    def _validate_normalized_ranges(self, positions_deg: Dict[str, float]) -> tuple[bool, str]:
+    def _positions_to_norm(self, positions_deg: Dict[str, float]) -> Dict[str, float]:
+        """Convert known joints from degrees to normalized values."""
+        deg_to_norm = self._deg_to_norm
+        return {name: deg_to_norm(name, deg) for name, deg in positions_deg.items() if name in self.motor_mapping}
+
+    def _validate_normalized_ranges(self, positions_deg: Dict[str, float], positions_norm: Dict[str, float]) -> tuple[bool, str]:
         """
         Validate that the target positions will result in normalized values within the robot's calibrated ranges.
+        `positions_norm` must be `_positions_to_norm(positions_deg)`, it is reused to build the action.
         Returns (is_valid, error_message)
         """
         errors = []
         
-        for joint_name, deg_value in positions_deg.items():
-            if joint_name not in self.motor_mapping:
-                continue
-                
-            norm_value = self._deg_to_norm(joint_name, deg_value)
-
-            if joint_name == "gripper":
-                norm_min, norm_max = 0, 100
-            else:
-                norm_min, norm_max = -100, 100
-            
-            # Handle inverted ranges (where norm_min > norm_max)
-            actual_min = min(norm_min, norm_max)
-            actual_max = max(norm_min, norm_max)
+        for joint_name, norm_value in positions_norm.items():
+            actual_min, actual_max = self._norm_limits[joint_name]
             
             if norm_value < actual_min or norm_value > actual_max:
                 errors.append(
-                    f"{joint_name.replace('_', ' ').title()} position {deg_value:.1f}° "
+                    f"{joint_name.replace('_', ' ').title()} position {positions_deg[joint_name]:.1f}° "
                     f"(normalized: {norm_value:.1f}) is outside valid range "
                     f"{actual_min:.1f} to {actual_max:.1f}"
                 )
@@ -187,14 +212,10 @@ class RobotController:
         
         return True, ""
 
-    def _build_action(self, positions_deg: Dict[str, float]) -> Dict[str, float]:
-        """Build action dictionary for lerobot."""
-        action = {}
-        
-        for name, deg in positions_deg.items():
-            norm_val = self._deg_to_norm(name, deg)
-            pos_key = f"arm_{name}.pos" if self.robot_type == "lekiwi" else f"{name}.pos"
-            action[pos_key] = norm_val
+    def _build_action(self, positions_norm: Dict[str, float]) -> Dict[str, float]:
+        """Build action dictionary for lerobot from normalized positions."""
+        pos_keys = self._pos_keys
+        action = {pos_keys[name]: norm for name, norm in positions_norm.items()}
         
         # Add base velocities for lekiwi
         if self.robot_type == "lekiwi":
@@ -210,41 +231,22 @@ class RobotController:
         try:
             observation = self.robot.get_observation()
             
-            if self.robot_type == "lekiwi":
-                # LeKiwi returns a state vector in observation.state
-                if "observation.state" in observation:
-                    state_vector = observation["observation.state"]
-                    # State order: arm_shoulder_pan.pos, arm_shoulder_lift.pos, arm_elbow_flex.pos, 
-                    #              arm_wrist_flex.pos, arm_wrist_roll.pos, arm_gripper.pos, x.vel, y.vel, theta.vel
-                    state_order = [
-                        "arm_shoulder_pan.pos", "arm_shoulder_lift.pos", "arm_elbow_flex.pos",
-                        "arm_wrist_flex.pos", "arm_wrist_roll.pos", "arm_gripper.pos",
-                        "x.vel", "y.vel", "theta.vel"
-                    ]
-                    
-                    for i, joint_name in enumerate(self.joint_names):
-                        pos_key = f"arm_{joint_name}.pos"
-                        if i < len(state_vector) and pos_key in state_order:
-                            idx = state_order.index(pos_key)
-                            norm_val = float(state_vector[idx])
-                            self.positions_norm[joint_name] = norm_val
-                            self.positions_deg[joint_name] = self._norm_to_deg(joint_name, norm_val)
+            # LeKiwi returns a state vector in observation.state, SO100/SO101 (and the
+            # LeKiwi fallback) use direct observation keys
+            state_vector = observation.get("observation.state") if self.robot_type == "lekiwi" else None
+            
+            for joint_name, pos_key in self._pos_keys.items():
+                if state_vector is not None:
+                    idx = self._state_indices.get(joint_name)
+                    if idx is None or idx >= len(state_vector):
+                        continue
+                    norm_val = float(state_vector[idx])
+                elif pos_key in observation:
+                    norm_val = observation[pos_key]
                 else:
-                    # Fallback: try direct observation keys
-                    for joint_name in self.joint_names:
-                        pos_key = f"arm_{joint_name}.pos"
-                        if pos_key in observation:
-                            norm_val = observation[pos_key]
-                            self.positions_norm[joint_name] = norm_val
-                            self.positions_deg[joint_name] = self._norm_to_deg(joint_name, norm_val)
-            else:
-                # SO100/SO101: direct observation keys
-                for joint_name in self.joint_names:
-                    pos_key = f"{joint_name}.pos"
-                    if pos_key in observation:
-                        norm_val = observation[pos_key]
-                        self.positions_norm[joint_name] = norm_val
-                        self.positions_deg[joint_name] = self._norm_to_deg(joint_name, norm_val)
+                    continue
+                self.positions_norm[joint_name] = norm_val
+                self.positions_deg[joint_name] = self._norm_to_deg(joint_name, norm_val)
             
             # Update cartesian coordinates
             fk_x, fk_z = self.kinematics.forward_kinematics(
@@ -254,13 +256,13 @@ class RobotController:
             self.cartesian_mm = {"x": fk_x, "z": fk_z}
             
         except Exception as e:
-            logger.error(f"Failed to read robot state: {e}", exc_info=True)
+            logger.error("Failed to read robot state: %s", e, exc_info=True)
 
     def _get_human_readable_state(self) -> Dict[str, float]:
         """Calculate human-readable state values."""
-        # Ensure all state dictionaries exist
-        positions_deg = getattr(self, 'positions_deg', {name: 0.0 for name in getattr(self, 'joint_names', [])})
-        cartesian_mm = getattr(self, 'cartesian_mm', {"x": 0.0, "z": 0.0})
+        # State dictionaries are initialized in __init__ before the robot connects
+        positions_deg = self.positions_deg
+        cartesian_mm = self.cartesian_mm
         
         return {
             "robot_rotation_clockwise_deg": positions_deg.get("shoulder_pan", 0.0) - 90,
@@ -275,10 +277,9 @@ class RobotController:
 
     def _get_full_state(self) -> Dict[str, Any]:
         """Get complete state dictionary."""
-        # Ensure all state dictionaries exist
-        positions_deg = getattr(self, 'positions_deg', {})
-        positions_norm = getattr(self, 'positions_norm', {})
-        cartesian_mm = getattr(self, 'cartesian_mm', {"x": 0.0, "z": 0.0})
+        positions_deg = self.positions_deg
+        positions_norm = self.positions_norm
+        cartesian_mm = self.cartesian_mm
         
         return {
             "joint_positions_deg": {name: round(pos, 1) for name, pos in positions_deg.items()},
@@ -301,12 +302,13 @@ class RobotController:
             return MoveResult(False, "Robot not connected", robot_state=self._get_full_state())
         
         # Filter valid joints
-        valid_positions = {name: pos for name, pos in positions_deg.items() if name in self.joint_names}
+        valid_positions = {name: pos for name, pos in positions_deg.items() if name in self._pos_keys}
         if not valid_positions:
             return MoveResult(True, "No valid joints to move", robot_state=self._get_full_state())
 
         # Validate that positions are within LeRobot's accepted ranges
-        is_valid, error_msg = self._validate_normalized_ranges(valid_positions)
+        valid_norm = self._positions_to_norm(valid_positions)
+        is_valid, error_msg = self._validate_normalized_ranges(valid_positions, valid_norm)
         if not is_valid:
             return MoveResult(False, error_msg, robot_state=self._get_full_state())
 
@@ -314,13 +316,12 @@ class RobotController:
             if use_interpolation:
                 self._execute_interpolated_move(valid_positions)
             else:
-                action = self._build_action(valid_positions)
+                action = self._build_action(valid_norm)
                 self.robot.send_action(action)
             
             # Update state optimistically
             self.positions_deg.update(valid_positions)
-            for name, deg in valid_positions.items():
-                self.positions_norm[name] = self._deg_to_norm(name, deg)
+            self.positions_norm.update(valid_norm)
             
             # Update cartesian if needed
             if "shoulder_lift" in valid_positions or "elbow_flex" in valid_positions:
@@ -331,7 +332,7 @@ class RobotController:
                 self.cartesian_mm = {"x": fk_x, "z": fk_z}
 
         except Exception as e:
-            logger.error(f"Move failed: {e}", exc_info=True)
+            logger.error("Move failed: %s", e, exc_info=True)
             self._refresh_state()
             return MoveResult(False, f"Move failed: {e}", robot_state=self._get_full_state())
         
@@ -353,21 +354,71 @@ class RobotController:
             int(max_change / self.movement_config["DEGREES_PER_STEP"])
         ))
         
+        # Precompute the whole move once. Degrees -> normalized is linear per joint, so interpolating
+        # normalized values directly yields the same steps without converting every step, and when
+        # both endpoints are within range every step in between is as well.
+        start_norm = self._positions_to_norm(start_positions)
+        target_norm = self._positions_to_norm(target_positions)
+        endpoints_valid = (
+            self._validate_normalized_ranges(start_positions, start_norm)[0]
+            and self._validate_normalized_ranges(target_positions, target_norm)[0]
+        )
+        pos_keys = self._pos_keys
+        norm_segments = [
+            (pos_keys[name], start_norm[name], target_norm[name] - start_norm[name]) for name in target_positions.keys()
+        ]
+        
+        # A single action dict is reused for every step, only its joint values are rewritten
+        action = self._build_action(target_norm)
+        target_action = dict(action)
+        
+        # Bind per-step lookups to locals, this loop runs at up to 100Hz
+        to_norm = self._positions_to_norm
+        validate = self._validate_normalized_ranges
+        send_action = self.robot.send_action
+        sleep = time.sleep
+        monotonic = time.monotonic
+        step_delay = self.movement_config["STEP_DELAY_SECONDS"]
+        
+        next_step_time = monotonic()
+        overruns = 0
         for i in range(1, steps + 1):
-            interpolated = {
-                name: start_positions[name] + (target_positions[name] - start_positions[name]) * (i / steps)
-                for name in target_positions.keys()
-            }
-            
-            # Validate each interpolation step to avoid sending invalid commands
-            is_valid, error_msg = self._validate_normalized_ranges(interpolated)
-            if not is_valid:
-                logger.warning(f"Interpolation step {i}/{steps} would exceed range limits, stopping interpolation")
-                break
+            fraction = i / steps
+            if not endpoints_valid:
+                # Validate each interpolation step to avoid sending invalid commands
+                interpolated = {
+                    name: start_positions[name] + (target_positions[name] - start_positions[name]) * fraction
+                    for name in target_positions.keys()
+                }
+                interpolated_norm = to_norm(interpolated)
+                is_valid, error_msg = validate(interpolated, interpolated_norm)
+                if not is_valid:
+                    logger.warning("Interpolation step %d/%d would exceed range limits, stopping interpolation", i, steps)
+                    break
+                for name, norm in interpolated_norm.items():
+                    action[pos_keys[name]] = norm
+            elif i == steps:
+                # Last step sends the validated target as-is, free of interpolation round-off
+                action.update(target_action)
+            else:
+                for key, start, delta in norm_segments:
+                    action[key] = start + delta * fraction
                 
-            action = self._build_action(interpolated)
-            self.robot.send_action(action)
-            time.sleep(self.movement_config["STEP_DELAY_SECONDS"])
+            send_action(action)
+            
+            # Pace steps against a deadline so bus I/O time doesn't stretch the step period
+            next_step_time += step_delay
+            sleep_for = next_step_time - monotonic()
+            if sleep_for > 0:
+                sleep(sleep_for)
+            elif sleep_for < -step_delay:
+                # Overran by more than a full step, resync instead of bursting to catch up
+                overruns += 1
+                next_step_time = monotonic()
+        
+        # Report overruns once per move rather than logging from inside the step loop
+        if overruns:
+            logger.debug("Interpolated move resynced after %d of %d steps overran", overruns, steps)
 
     def increment_joints_by_delta(self, deltas_deg: Dict[str, float]) -> MoveResult:
         """Increment joints by delta degrees."""
@@ -377,11 +428,14 @@ class RobotController:
         target_positions = {}
         warnings = []
         
+        positions_deg = self.positions_deg
         for joint_name, delta in deltas_deg.items():
-            if joint_name not in self.joint_names:
+            # positions_deg is keyed by joint name, one lookup both checks and fetches the joint
+            current = positions_deg.get(joint_name)
+            if current is None:
                 warnings.append(f"Unknown joint '{joint_name}' ignored.")
                 continue
-            target_positions[joint_name] = self.positions_deg[joint_name] + delta
+            target_positions[joint_name] = current + delta
         
         if not target_positions:
             return MoveResult(False, "No valid joints for increment.", warnings, self._get_full_state())
@@ -405,8 +459,8 @@ class RobotController:
             
         target_positions = self.positions_deg.copy()
         
-        # Handle cartesian movements
-        if move_gripper_up_mm is not None or move_gripper_forward_mm is not None:
+        # Handle cartesian movements (zero offsets leave the arm where it is, so skip IK)
+        if move_gripper_up_mm or move_gripper_forward_mm:
             target_x = self.cartesian_mm["x"] + (move_gripper_forward_mm or 0.0)
             target_z = self.cartesian_mm["z"] + (move_gripper_up_mm or 0.0)
             
@@ -443,11 +497,11 @@ class RobotController:
         if self.read_only:
             return MoveResult(False, "Cannot move robot in read-only mode", robot_state=self._get_full_state())
             
-        if preset_key not in self.presets:
+        preset_positions = self.presets.get(preset_key)
+        if preset_positions is None:
             return MoveResult(False, f"Unknown preset: '{preset_key}'", robot_state=self._get_full_state())
         
-        preset_positions = self.presets[preset_key]
-        logger.info(f"Applying preset '{preset_key}': {preset_positions}")
+        logger.info("Applying preset '%s': %s", preset_key, preset_positions)
         return self.set_joints_absolute(preset_positions)
 
     def get_camera_images(self) -> Dict[str, np.ndarray]:
@@ -470,15 +524,14 @@ class RobotController:
                             camera_images[camera_name] = value
             else:
                 # SO100/SO101: direct camera names as numpy arrays
-                camera_names = list(robot_config.lerobot_config.get("cameras", {}).keys())
-                camera_images = {
-                    key: value for key, value in observation.items()
-                    if key in camera_names and isinstance(value, np.ndarray) and value.ndim == 3
-                }
+                for camera_name in self._camera_names:
+                    value = observation.get(camera_name)
+                    if isinstance(value, np.ndarray) and value.ndim == 3:
+                        camera_images[camera_name] = value
             
             return camera_images
         except Exception as e:
-            logger.error(f"Error getting camera images: {e}", exc_info=True)
+            logger.error("Error getting camera images: %s", e, exc_info=True)
             return {}
 
     def disconnect(self, reset_pos: bool = True) -> None:
@@ -493,9 +546,9 @@ class RobotController:
             try:
                 result = self.apply_named_preset("1")
                 if not result.ok:
-                    logger.warning(f"Rest position failed: {result.msg}")
+                    logger.warning("Rest position failed: %s", result.msg)
             except Exception as e:
-                logger.error(f"Error during rest position: {e}", exc_info=True)
+                logger.error("Error during rest position: %s", e, exc_info=True)
         elif reset_pos and self.read_only:
             logger.info("Skipping rest position in read-only mode")
         
@@ -503,6 +556,6 @@ class RobotController:
             self.robot.disconnect()
             logger.info("Robot disconnected successfully")
         except Exception as e:
-            logger.error(f"Error during disconnect: {e}", exc_info=True)
+            logger.error("Error during disconnect: %s", e, exc_info=True)
         finally:
             self.robot = None